@@ -29,6 +29,13 @@ async def main() -> None:
                 settings.postgres_user, settings.postgres_host,
                 settings.postgres_port, settings.postgres_db)
 
+    from bot.db.session import warm_pool
+
+    try:
+        await warm_pool()
+    except Exception as e:
+        logger.warning("Could not pre-warm DB connection pool: %s", e)
+
     # Import adapter here to avoid loading aiogram before logging is configured
     from bot.adapters.telegram.bot import TelegramAdapter
 
@@ -76,11 +76,21 @@ class RoleMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         async with async_session_factory() as session:
-            # Load user (with cache — avoids DB hit on every message)
-            from bot.services.pg_cache import pg_cache_get, pg_cache_set
+            # Look up the cached user and group-chat project ids in one
+            # round-trip (avoids DB hits on every message)
+            from bot.services.pg_cache import pg_cache_get_many, pg_cache_set_many
             cache_key = f"user:tg:{tg_user.id}"
-            cached_user_id = await pg_cache_get(session, cache_key)
+            proj_cache_key = None
+            if chat_id and chat_id < 0:  # negative = group chat
+                proj_cache_key = f"project:chat:{chat_id}"
+            cached_ids = await pg_cache_get_many(
+                session, [cache_key, proj_cache_key] if proj_cache_key else [cache_key],
+            )
+            # Ids resolved on a cache miss, written back together below
+            to_cache: dict[str, int] = {}
 
+            # Load user
+            cached_user_id = cached_ids.get(cache_key)
             if cached_user_id is not None:
                 # Cache hit — load user by internal ID (faster than telegram_id lookup)
                 from bot.db.repositories import get_user_by_id
@@ -88,26 +98,27 @@ class RoleMiddleware(BaseMiddleware):
             else:
                 user = await get_user_by_telegram_id(session, tg_user.id)
                 if user:
-                    await pg_cache_set(session, cache_key, user.id, ttl=600)
-                    await session.commit()
+                    to_cache[cache_key] = user.id
             logger.debug(
                 "RoleMiddleware: tg_user.id=%d, found user=%s, chat_id=%s",
                 tg_user.id, user, chat_id,
             )
 
-            # Load project from group chat (with cache)
+            # Load project from group chat
             project = None
-            if chat_id and chat_id < 0:  # negative = group chat
-                proj_cache_key = f"project:chat:{chat_id}"
-                cached_proj_id = await pg_cache_get(session, proj_cache_key)
+            if proj_cache_key:
+                cached_proj_id = cached_ids.get(proj_cache_key)
                 if cached_proj_id is not None:
                     from bot.db.repositories import get_project_with_stages
                     project = await get_project_with_stages(session, cached_proj_id)
                 else:
                     project = await get_project_by_telegram_chat_id(session, chat_id)
                     if project:
-                        await pg_cache_set(session, proj_cache_key, project.id, ttl=600)
-                        await session.commit()
+                        to_cache[proj_cache_key] = project.id
+
+            if to_cache:
+                await pg_cache_set_many(session, to_cache, ttl=600)
+                await session.commit()
 
             # Load roles
             user_roles: list[RoleType] = []
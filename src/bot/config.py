@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     postgres_password: str = "password"
     postgres_host: str = "localhost"
     postgres_port: int = 5432
+    db_pool_size: int = 10                # connections kept open (and pre-warmed)
+    db_max_overflow: int = 20             # extra connections under burst load
 
     @property
     def database_url(self) -> str:
@@ -105,6 +107,14 @@ class Settings(BaseSettings):
     mention_gate_enabled: bool = True
     mention_gate_patterns: str = ""       # Comma-separated extra mention patterns
 
+    # ── Cache ─────────────────────────────────────────────────
+    # In-process L1 in front of the PostgreSQL cache table. Saves a DB
+    # round-trip for hot keys, but invalidations made by *other* processes
+    # are only seen after cache_l1_ttl seconds.
+    cache_l1_enabled: bool = False
+    cache_l1_size: int = 512
+    cache_l1_ttl: float = 30.0
+
     # ── Skills (AI prompt management) ────────────────────────
     skills_dir: str = ""                  # Custom skills directory (default: skills/)
 
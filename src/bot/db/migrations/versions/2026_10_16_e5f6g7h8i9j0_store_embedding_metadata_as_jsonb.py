@@ -0,0 +1,32 @@
+"""store_embedding_metadata_as_jsonb
+
+Convert embeddings.metadata from a TEXT JSON string to native JSONB.
+
+The driver now hands dicts to/from PostgreSQL directly, so the Python
+side no longer serializes on insert or parses every returned row.
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'e5f6g7h8i9j0'
+down_revision: Union[str, None] = 'd4e5f6g7h8i9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE embeddings ALTER COLUMN metadata TYPE jsonb USING metadata::jsonb"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE embeddings ALTER COLUMN metadata TYPE text USING metadata::text"
+    )
@@ -0,0 +1,33 @@
+"""add_embeddings_project_id_index
+
+Add a B-tree index on embeddings (project_id, id).
+
+Every search filters by project_id, but the table only had a tenant_id
+index. The embedding column is an untyped ``vector`` (dimension set by
+AI_EMBEDDING_DIMENSIONS), which pgvector cannot build HNSW on, so the
+similarity search is an exact scan — this index lets the planner
+restrict that scan to one project's rows before computing distances.
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'f6g7h8i9j0k1'
+down_revision: Union[str, None] = 'e5f6g7h8i9j0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_embeddings_project_id_id', 'embeddings', ['project_id', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embeddings_project_id_id', table_name='embeddings')
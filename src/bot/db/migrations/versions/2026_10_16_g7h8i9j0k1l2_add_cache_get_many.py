@@ -0,0 +1,35 @@
+"""add_cache_get_many
+
+Add cache_get_many(TEXT[]) — fetch several cache keys in one round-trip.
+Missing and expired keys are simply absent from the result.
+
+Revision ID: g7h8i9j0k1l2
+Revises: f6g7h8i9j0k1
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text as sa_text
+
+revision: str = 'g7h8i9j0k1l2'
+down_revision: Union[str, None] = 'f6g7h8i9j0k1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa_text("""
+        CREATE OR REPLACE FUNCTION cache_get_many(p_keys TEXT[])
+        RETURNS TABLE (key TEXT, value JSONB) LANGUAGE sql STABLE AS $$
+            SELECT c.key, c.value FROM cache c
+            WHERE c.key = ANY(p_keys) AND c.expires_at > now();
+        $$
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa_text("DROP FUNCTION IF EXISTS cache_get_many(TEXT[])"))
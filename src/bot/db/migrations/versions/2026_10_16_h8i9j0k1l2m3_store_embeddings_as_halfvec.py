@@ -0,0 +1,34 @@
+"""store_embeddings_as_halfvec
+
+Store embeddings.embedding as half-precision ``halfvec`` (pgvector 0.7+).
+
+Similarity search over this table is a per-project exact scan, so its
+cost is dominated by reading the vectors. fp16 halves the bytes per row
+(e.g. 6 KB → 3 KB at 1536 dims) with no practical effect on cosine
+ranking. The column stays dimension-less like before.
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = 'h8i9j0k1l2m3'
+down_revision: Union[str, None] = 'g7h8i9j0k1l2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE embeddings ALTER COLUMN embedding TYPE halfvec USING embedding::halfvec"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE embeddings ALTER COLUMN embedding TYPE vector USING embedding::vector"
+    )
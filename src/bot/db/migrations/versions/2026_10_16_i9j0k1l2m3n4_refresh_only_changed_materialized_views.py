@@ -0,0 +1,101 @@
+"""refresh_only_changed_materialized_views
+
+Track which materialized views are stale and refresh only those:
+1. mv_refresh_log — append-only log of views whose source table changed
+2. Statement-level triggers on budget_items / stages log their view
+3. refresh_materialized_views() drains the log instead of
+   refreshing every view on every call
+
+The log has no unique key on purpose: triggers only ever insert new
+rows, so user writes never wait on a refresh that is draining the log.
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text as sa_text
+
+revision: str = 'i9j0k1l2m3n4'
+down_revision: Union[str, None] = 'h8i9j0k1l2m3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (source table, materialized view)
+_SOURCES = (
+    ("budget_items", "mv_budget_summary"),
+    ("stages", "mv_stage_progress"),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # ── 1. Log of stale views (seeded so the first refresh is full) ──
+    conn.execute(sa_text("""
+        CREATE TABLE IF NOT EXISTS mv_refresh_log (
+            view_name TEXT NOT NULL
+        )
+    """))
+    conn.execute(sa_text("""
+        INSERT INTO mv_refresh_log (view_name)
+        VALUES ('mv_budget_summary'), ('mv_stage_progress')
+    """))
+
+    # ── 2. Mark a view stale once per statement, not once per row ──
+    # Plain INSERT: never conflicts with rows a running refresh has deleted
+    conn.execute(sa_text("""
+        CREATE OR REPLACE FUNCTION mark_mv_stale()
+        RETURNS TRIGGER LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO mv_refresh_log (view_name) VALUES (TG_ARGV[0]);
+            RETURN NULL;
+        END; $$
+    """))
+
+    for table, view in _SOURCES:
+        conn.execute(sa_text(f"""
+            CREATE TRIGGER trg_{table}_mark_mv_stale
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION mark_mv_stale('{view}')
+        """))
+
+    # ── 3. Refresh only what changed since the last call ──
+    conn.execute(sa_text("""
+        CREATE OR REPLACE FUNCTION refresh_materialized_views()
+        RETURNS VOID LANGUAGE plpgsql AS $$
+        DECLARE
+            views TEXT[];
+            v TEXT;
+        BEGIN
+            WITH drained AS (
+                DELETE FROM mv_refresh_log RETURNING view_name
+            )
+            SELECT array_agg(DISTINCT view_name) INTO views FROM drained;
+
+            FOREACH v IN ARRAY coalesce(views, '{}') LOOP
+                EXECUTE format('REFRESH MATERIALIZED VIEW CONCURRENTLY %I', v);
+            END LOOP;
+        END; $$
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+
+    conn.execute(sa_text("""
+        CREATE OR REPLACE FUNCTION refresh_materialized_views()
+        RETURNS VOID LANGUAGE plpgsql AS $$
+        BEGIN
+            REFRESH MATERIALIZED VIEW CONCURRENTLY mv_budget_summary;
+            REFRESH MATERIALIZED VIEW CONCURRENTLY mv_stage_progress;
+        END; $$
+    """))
+
+    for table, _ in _SOURCES:
+        conn.execute(sa_text(f"DROP TRIGGER IF EXISTS trg_{table}_mark_mv_stale ON {table}"))
+    conn.execute(sa_text("DROP FUNCTION IF EXISTS mark_mv_stale()"))
+    conn.execute(sa_text("DROP TABLE IF EXISTS mv_refresh_log"))
@@ -0,0 +1,40 @@
+"""ensure_cache_table_unlogged
+
+The cache table is created UNLOGGED, but CREATE TABLE IF NOT EXISTS
+keeps a pre-existing logged table as-is.  Convert it if needed so
+cache writes never generate WAL (its indexes follow the table).
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text as sa_text
+
+revision: str = 'j0k1l2m3n4o5'
+down_revision: Union[str, None] = 'i9j0k1l2m3n4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa_text("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_class
+                WHERE oid = 'cache'::regclass AND relpersistence = 'p'
+            ) THEN
+                ALTER TABLE cache SET UNLOGGED;
+            END IF;
+        END $$
+    """))
+
+
+def downgrade() -> None:
+    # The table was always meant to be UNLOGGED — nothing to restore
+    pass
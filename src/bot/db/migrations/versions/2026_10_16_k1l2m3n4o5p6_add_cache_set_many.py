@@ -0,0 +1,39 @@
+"""add_cache_set_many
+
+Add cache_set_many(TEXT[], JSONB[], INTEGER) — upsert several cache
+entries with the same TTL in one statement.
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-16
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text as sa_text
+
+revision: str = 'k1l2m3n4o5p6'
+down_revision: Union[str, None] = 'j0k1l2m3n4o5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa_text("""
+        CREATE OR REPLACE FUNCTION cache_set_many(
+            p_keys TEXT[], p_values JSONB[], p_ttl_seconds INTEGER DEFAULT 300
+        ) RETURNS VOID LANGUAGE sql AS $$
+            INSERT INTO cache (key, value, expires_at)
+            SELECT u.key, u.value, now() + (p_ttl_seconds || ' seconds')::interval
+            FROM unnest(p_keys, p_values) AS u(key, value)
+            ON CONFLICT (key) DO UPDATE SET
+                value = EXCLUDED.value, created_at = now(), expires_at = EXCLUDED.expires_at;
+        $$
+    """))
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    conn.execute(sa_text("DROP FUNCTION IF EXISTS cache_set_many(TEXT[], JSONB[], INTEGER)"))
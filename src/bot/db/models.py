@@ -16,8 +16,9 @@ This module defines the complete database schema:
 
 import enum
 from datetime import datetime
+from typing import Any
 
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import (
     BigInteger,
     Boolean,
@@ -31,7 +32,7 @@ from sqlalchemy import (
     Text,
     func,
 )
-from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -370,8 +371,12 @@ class Embedding(Base):
     )
     project_id: Mapped[int | None] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"))
     content: Mapped[str] = mapped_column(Text)
-    embedding = mapped_column(Vector())  # dimensions set by AI_EMBEDDING_DIMENSIONS
-    metadata_: Mapped[str | None] = mapped_column("metadata", Text)  # JSON string
+    # fp16 storage; dimensions set by AI_EMBEDDING_DIMENSIONS
+    embedding = mapped_column(HALFVEC())
+    # none_as_null: missing metadata is SQL NULL, not the JSON 'null' value
+    metadata_: Mapped[dict[str, Any] | None] = mapped_column(
+        "metadata", JSONB(none_as_null=True)
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Full-text search vector — auto-generated from content
@@ -381,6 +386,12 @@ class Embedding(Base):
         nullable=True,
     )
 
+    # Searches are always scoped to one project: (project_id, id) narrows
+    # them to that project's rows.  The table is deliberately not
+    # partitioned by project — the dimensionless embedding column can't
+    # carry an ANN index to localize per partition, so pruning would buy
+    # nothing over this index.
     __table_args__ = (
         Index("ix_embeddings_search_tsv", "search_tsv", postgresql_using="gin"),
+        Index("ix_embeddings_project_id_id", "project_id", "id"),
     )
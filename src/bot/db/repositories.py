@@ -7,6 +7,7 @@ cleanly separated.
 """
 
 import logging
+import re
 from datetime import date, datetime, timedelta
 from typing import Any, Sequence
 
@@ -33,6 +34,9 @@ from bot.db.models import (
 
 logger = logging.getLogger(__name__)
 
+# Word tokens for tsquery building — tokenizes and drops 1-char words in one scan
+_TSQUERY_TOKEN_RE = re.compile(r"\w{2,}")
+
 
 # ═══════════════════════════════════════════════════════════════
 # TENANT OPERATIONS
@@ -1490,6 +1494,34 @@ async def get_messages_grouped_by_user(
     return grouped
 
 
+async def get_messages_for_user(
+    session: AsyncSession,
+    project_id: int,
+    user_id: int,
+    *,
+    limit: int = 200,
+) -> Sequence[Message]:
+    """
+    Fetch one user's non-bot messages for a project (oldest-first).
+
+    Same filters and ordering as ``get_messages_grouped_by_user``, but
+    limited in SQL so only this user's rows are loaded.
+    """
+    result = await session.execute(
+        select(Message)
+        .where(
+            Message.project_id == project_id,
+            Message.user_id == user_id,
+            Message.is_from_bot == False,  # noqa: E712
+            Message.transcribed_text.isnot(None),
+        )
+        .options(selectinload(Message.user))
+        .order_by(Message.created_at.asc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
 async def search_messages_fulltext(
     session: AsyncSession,
     project_id: int,
@@ -1504,10 +1536,8 @@ async def search_messages_fulltext(
     """
     from sqlalchemy import text as sa_text
 
-    # Build a simple tsquery from the input words
-    tokens = query_text.split()
-    clean = [t.strip(".,;:!?\"'()[]{}«»—–") for t in tokens]
-    clean = [t for t in clean if len(t) >= 2]
+    # Build a simple tsquery from the input words (≥2 word chars each)
+    clean = _TSQUERY_TOKEN_RE.findall(query_text)
     if not clean:
         return []
     tsq = " | ".join(f"{t}:*" for t in clean)
@@ -6,8 +6,10 @@ Usage:
         result = await session.execute(select(User))
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from bot.config import settings
@@ -15,8 +17,19 @@ from bot.config import settings
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,  # log SQL statements when DEBUG=true
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    # JSON/JSONB columns are (de)serialized with orjson instead of stdlib json
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    # Prepared statements kept per connection (default 100) — large enough
+    # for all hot queries (cache, RAG search, repositories) to stay prepared.
+    # JIT compilation only pays off for long analytical queries; for these
+    # short OLTP statements it adds planning latency.
+    connect_args={
+        "prepared_statement_cache_size": 500,
+        "server_settings": {"jit": "off"},
+    },
 )
 
 async_session_factory = async_sessionmaker(
@@ -35,3 +48,25 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def warm_pool() -> None:
+    """
+    Open ``pool_size`` connections up front.
+
+    Connections are held simultaneously (otherwise the pool would hand
+    back the same one) and then returned, so the first user requests
+    don't pay for TCP/TLS setup and authentication.
+    """
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.db_pool_size)),
+        return_exceptions=True,
+    )
+    # Return every connection that did open before surfacing a failure,
+    # so a partial warm-up doesn't leak connections out of the pool
+    await asyncio.gather(
+        *(conn.close() for conn in results if not isinstance(conn, BaseException))
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
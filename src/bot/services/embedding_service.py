@@ -1,15 +1,20 @@
 """
 Embedding service — generate, store, and search vector embeddings.
 
-Uses pgvector HNSW index for fast approximate nearest-neighbor search
-over text-embedding-3-small (1536-dim) embeddings.
+Embeddings are stored as pgvector ``halfvec`` (fp16) and searched by
+cosine distance within a project (pre-filtered by the project_id index).
+
+Vector queries take the top_k nearest rows first and apply the similarity
+floor to that result: a distance predicate inside the ORDER BY ... LIMIT
+scan would stop a vector index from serving it.
 """
 
-import json
+import asyncio
 import logging
 from typing import Any
 
-from sqlalchemy import text
+import orjson
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db.models import Embedding
@@ -17,6 +22,9 @@ from bot.services.ai_client import generate_embedding, generate_embeddings_batch
 
 logger = logging.getLogger(__name__)
 
+# Texts per embedding request in embed_and_store_batch
+_BATCH_CHUNK_SIZE = 64
+
 
 async def embed_and_store(
     session: AsyncSession,
@@ -51,7 +59,7 @@ async def embed_and_store(
         project_id=project_id,
         content=content,
         embedding=vector,
-        metadata_=json.dumps(metadata, ensure_ascii=False) if metadata else None,
+        metadata_=metadata or None,
     )
     session.add(emb)
     await session.flush()
@@ -71,37 +79,126 @@ async def embed_and_store_batch(
 
     Each item: {"content": str, "metadata": dict | None}
 
+    Items are processed in chunks of ``_BATCH_CHUNK_SIZE``: while one
+    chunk is being inserted, the embedding request for the next
+    chunk is already in flight, so API latency overlaps with DB writes.
+
     Returns:
-        List of created Embedding rows.
+        List of created Embedding rows (detached — built from the inserted
+        values and returned ids, not reloaded from the DB).
     """
     if not is_ai_configured():
         logger.warning("AI not configured — skipping batch embedding")
         return []
 
-    texts = [item["content"] for item in items if item.get("content", "").strip()]
-    if not texts:
+    valid = [item for item in items if item.get("content", "").strip()]
+    if not valid:
         return []
 
-    vectors = await generate_embeddings_batch(texts)
+    chunks = [
+        valid[i:i + _BATCH_CHUNK_SIZE] for i in range(0, len(valid), _BATCH_CHUNK_SIZE)
+    ]
 
-    embeddings: list[Embedding] = []
-    for item_data, vector in zip(items, vectors):
-        content = item_data["content"]
-        metadata = item_data.get("metadata")
-        emb = Embedding(
-            project_id=project_id,
-            content=content,
-            embedding=vector,
-            metadata_=json.dumps(metadata, ensure_ascii=False) if metadata else None,
+    def _embed(chunk: list[dict[str, Any]]) -> asyncio.Task[list[list[float]]]:
+        return asyncio.create_task(
+            generate_embeddings_batch([item["content"] for item in chunk])
         )
-        session.add(emb)
-        embeddings.append(emb)
 
-    await session.flush()
+    embeddings: list[Embedding] = []
+    pending = _embed(chunks[0])
+    try:
+        for idx, chunk in enumerate(chunks):
+            vectors = await pending
+            if idx + 1 < len(chunks):
+                pending = _embed(chunks[idx + 1])
+
+            rows = [
+                {
+                    "project_id": project_id,
+                    "content": item_data["content"],
+                    "embedding": vector,
+                    "metadata_": item_data.get("metadata") or None,
+                }
+                for item_data, vector in zip(chunk, vectors)
+            ]
+            # One multi-row INSERT per chunk, returning only the new ids
+            # (not the vectors we just sent) — objects are built locally
+            ids = await session.scalars(
+                insert(Embedding).returning(Embedding.id, sort_by_parameter_order=True),
+                rows,
+            )
+            embeddings.extend(Embedding(id=eid, **row) for eid, row in zip(ids, rows))
+    finally:
+        # Don't leave an orphaned embedding request if an insert failed
+        pending.cancel()
+
     logger.info("Stored %d embeddings for project_id=%d", len(embeddings), project_id)
     return embeddings
 
 
+def vector_literal(vector: list[float]) -> str:
+    """
+    Format a Python vector as a pgvector text literal.
+
+    orjson's float-list output (``[0.1,-0.2,...]``) is exactly pgvector's
+    text format and is produced in native code, not a per-element loop.
+    """
+    return orjson.dumps(vector).decode()
+
+
+async def _search_vectorizer(
+    session: AsyncSession,
+    *,
+    project_id: int,
+    vec_str: str,
+    top_k: int,
+    min_similarity: float,
+) -> list[dict[str, Any]]:
+    """
+    Search the pgai vectorizer table (message chunks).
+
+    Returns [] if the table does not exist yet.
+    """
+    try:
+        auto_sql = text("""
+            WITH nearest AS (
+                SELECT
+                    e.id, e.chunk AS content,
+                    e.embedding <=> CAST(:query_vec AS vector) AS distance
+                FROM messages_embeddings_auto e
+                JOIN messages m ON e.id = m.id
+                WHERE m.project_id = :project_id
+                ORDER BY e.embedding <=> CAST(:query_vec AS vector)
+                LIMIT :top_k
+            )
+            SELECT id, content, 1 - distance AS similarity
+            FROM nearest
+            WHERE distance <= :max_dist
+            ORDER BY distance
+        """)
+        auto_result = await session.execute(auto_sql, {
+            "query_vec": vec_str,
+            "project_id": project_id,
+            "max_dist": 1 - min_similarity,
+            "top_k": top_k,
+        })
+        return [
+            {
+                "id": row["id"],
+                "content": row["content"] or "",
+                "metadata": {"source": "vectorizer"},
+                "similarity": float(row["similarity"]),
+            }
+            for row in auto_result.mappings()
+        ]
+    except Exception as e:
+        # Table may not exist yet (migration not run)
+        # Rollback the failed transaction so subsequent queries work
+        await session.rollback()
+        logger.debug("Vectorizer table search failed (may not exist yet): %s", e)
+        return []
+
+
 async def search_similar(
     session: AsyncSession,
     *,
@@ -122,80 +219,54 @@ async def search_similar(
     if not is_ai_configured():
         return []
 
-    query_vector = await generate_embedding(query_text)
-    vec_str = "[" + ",".join(str(v) for v in query_vector) + "]"
+    vec_str = vector_literal(await generate_embedding(query_text))
 
     results: list[dict[str, Any]] = []
     seen_content: set[str] = set()
 
     # 1. Search pgai vectorizer table (auto-generated embeddings)
-    try:
-        auto_sql = text("""
-            SELECT
-                e.id, e.chunk AS content,
-                1 - (e.embedding <=> CAST(:query_vec AS vector)) AS similarity
-            FROM messages_embeddings_auto e
-            JOIN messages m ON e.id = m.id
-            WHERE m.project_id = :project_id
-              AND 1 - (e.embedding <=> CAST(:query_vec AS vector)) >= :min_sim
-            ORDER BY e.embedding <=> CAST(:query_vec AS vector)
-            LIMIT :top_k
-        """)
-        auto_result = await session.execute(auto_sql, {
-            "query_vec": vec_str,
-            "project_id": project_id,
-            "min_sim": min_similarity,
-            "top_k": top_k,
-        })
-        for row in auto_result.fetchall():
-            content = row.content or ""
-            if content not in seen_content:
-                seen_content.add(content)
-                results.append({
-                    "id": row.id,
-                    "content": content,
-                    "metadata": {"source": "vectorizer"},
-                    "similarity": float(row.similarity),
-                })
-    except Exception as e:
-        # Table may not exist yet (migration not run)
-        # Rollback the failed transaction so subsequent queries work
-        await session.rollback()
-        logger.debug("Vectorizer table search failed (may not exist yet): %s", e)
+    for item in await _search_vectorizer(
+        session,
+        project_id=project_id,
+        vec_str=vec_str,
+        top_k=top_k,
+        min_similarity=min_similarity,
+    ):
+        if item["content"] not in seen_content:
+            seen_content.add(item["content"])
+            results.append(item)
 
     # 2. Search legacy embeddings table (manual/backfill embeddings)
     legacy_sql = text("""
-        SELECT
-            id, content,
-            metadata AS metadata_,
-            1 - (embedding <=> CAST(:query_vec AS vector)) AS similarity
-        FROM embeddings
-        WHERE project_id = :project_id
-          AND 1 - (embedding <=> CAST(:query_vec AS vector)) >= :min_sim
-        ORDER BY embedding <=> CAST(:query_vec AS vector)
-        LIMIT :top_k
+        WITH nearest AS (
+            SELECT
+                id, content, metadata,
+                embedding <=> CAST(:query_vec AS halfvec) AS distance
+            FROM embeddings
+            WHERE project_id = :project_id
+            ORDER BY embedding <=> CAST(:query_vec AS halfvec)
+            LIMIT :top_k
+        )
+        SELECT id, content, metadata, 1 - distance AS similarity
+        FROM nearest
+        WHERE distance <= :max_dist
+        ORDER BY distance
     """)
     legacy_result = await session.execute(legacy_sql, {
         "query_vec": vec_str,
         "project_id": project_id,
-        "min_sim": min_similarity,
+        "max_dist": 1 - min_similarity,
         "top_k": top_k,
     })
-    for row in legacy_result.fetchall():
-        content = row.content or ""
+    for row in legacy_result.mappings():
+        content = row["content"] or ""
         if content not in seen_content:
             seen_content.add(content)
-            metadata = None
-            if row.metadata_:
-                try:
-                    metadata = json.loads(row.metadata_)
-                except json.JSONDecodeError:
-                    metadata = {"raw": row.metadata_}
             results.append({
-                "id": row.id,
+                "id": row["id"],
                 "content": content,
-                "metadata": metadata,
-                "similarity": float(row.similarity),
+                "metadata": row["metadata"],
+                "similarity": float(row["similarity"]),
             })
 
     # Sort by similarity descending and limit
@@ -214,26 +285,16 @@ async def search_similar(
 
 # ── Full-text search (tsvector / tsquery) ────────────────────
 
-
-def _build_tsquery(query_text: str) -> str:
-    """
-    Build a PostgreSQL tsquery string from a user query.
-
-    Tokenises the input, drops very short tokens, and joins with '|' (OR)
-    so that any keyword match counts.  Uses the 'simple' text-search
-    config (language-agnostic, works well for Russian).
-    """
-    tokens = query_text.split()
-    # Keep tokens with ≥2 chars; strip punctuation
-    clean = []
-    for t in tokens:
-        t = t.strip(".,;:!?\"'()[]{}«»—–")
-        if len(t) >= 2:
-            clean.append(t)
-    if not clean:
-        return query_text.strip() or ""
-    # prefix matching (lexeme:*) so partial words still hit
-    return " | ".join(f"{t}:*" for t in clean)
+# Builds the tsquery ``q.tsq`` from :query_text inside PostgreSQL
+_FTS_QUERY_CTE = """
+        WITH q AS (
+            SELECT to_tsquery(
+                'simple',
+                string_agg(quote_literal(lexeme) || ':*', ' | ')
+            ) AS tsq
+            FROM unnest(to_tsvector('simple', :query_text))
+            WHERE length(lexeme) >= 2
+        )"""
 
 
 async def search_fulltext(
@@ -249,47 +310,37 @@ async def search_fulltext(
     Searches the ``search_tsv`` generated column with a 'simple'-config
     tsquery.  Results are ranked by ``ts_rank``.
 
+    The tsquery is built inside PostgreSQL: the query text is lexed by
+    ``to_tsvector('simple', ...)``, lexemes shorter than 2 chars are
+    dropped, and the rest are OR-ed as prefix matches (``lexeme:*``) so
+    that any (partial) keyword match counts.
+
     Returns:
         List of dicts: {"id", "content", "metadata", "rank"}
         sorted by descending rank.
     """
-    tsq = _build_tsquery(query_text)
-    if not tsq:
+    if not query_text or not query_text.strip():
         return []
 
-    sql = text("""
+    sql = text(f"""
+        {_FTS_QUERY_CTE}
         SELECT
-            id,
-            content,
-            metadata AS metadata_,
-            ts_rank(search_tsv, to_tsquery('simple', :tsq)) AS rank
-        FROM embeddings
-        WHERE project_id = :project_id
-          AND search_tsv @@ to_tsquery('simple', :tsq)
+            e.id,
+            e.content,
+            e.metadata,
+            ts_rank(e.search_tsv, q.tsq) AS rank
+        FROM embeddings e, q
+        WHERE e.project_id = :project_id
+          AND e.search_tsv @@ q.tsq
         ORDER BY rank DESC
         LIMIT :top_k
     """)
 
     result = await session.execute(
         sql,
-        {"project_id": project_id, "tsq": tsq, "top_k": top_k},
+        {"project_id": project_id, "query_text": query_text, "top_k": top_k},
     )
-    rows = result.fetchall()
-
-    results = []
-    for row in rows:
-        metadata = None
-        if row.metadata_:
-            try:
-                metadata = json.loads(row.metadata_)
-            except json.JSONDecodeError:
-                metadata = {"raw": row.metadata_}
-        results.append({
-            "id": row.id,
-            "content": row.content,
-            "metadata": metadata,
-            "rank": float(row.rank),
-        })
+    results = [dict(row) for row in result.mappings()]
 
     logger.debug(
         "Full-text search: project_id=%d query='%s' → %d results",
@@ -301,6 +352,87 @@ async def search_fulltext(
 # ── Hybrid search (vector + full-text, RRF fusion) ──────────
 
 
+# Hybrid hits are keyed by (table, id) — ids of the two source tables can collide
+_HitKey = tuple[str, int]
+
+
+async def _search_similar_ids(
+    session: AsyncSession,
+    *,
+    project_id: int,
+    vec_str: str,
+    top_k: int,
+    min_similarity: float,
+) -> list[tuple[int, float]]:
+    """Vector arm over ``embeddings`` returning only (id, similarity)."""
+    sql = text("""
+        WITH nearest AS (
+            SELECT id, embedding <=> CAST(:query_vec AS halfvec) AS distance
+            FROM embeddings
+            WHERE project_id = :project_id
+            ORDER BY embedding <=> CAST(:query_vec AS halfvec)
+            LIMIT :top_k
+        )
+        SELECT id, 1 - distance AS similarity
+        FROM nearest
+        WHERE distance <= :max_dist
+        ORDER BY distance
+    """)
+    result = await session.execute(sql, {
+        "query_vec": vec_str,
+        "project_id": project_id,
+        "max_dist": 1 - min_similarity,
+        "top_k": top_k,
+    })
+    return [(row.id, float(row.similarity)) for row in result]
+
+
+async def _search_fulltext_ids(
+    session: AsyncSession,
+    *,
+    project_id: int,
+    query_text: str,
+    top_k: int,
+) -> list[tuple[int, float]]:
+    """Full-text arm over ``embeddings`` returning only (id, rank)."""
+    if not query_text or not query_text.strip():
+        return []
+
+    sql = text(f"""
+        {_FTS_QUERY_CTE}
+        SELECT e.id, ts_rank(e.search_tsv, q.tsq) AS rank
+        FROM embeddings e, q
+        WHERE e.project_id = :project_id
+          AND e.search_tsv @@ q.tsq
+        ORDER BY rank DESC
+        LIMIT :top_k
+    """)
+    result = await session.execute(
+        sql,
+        {"project_id": project_id, "query_text": query_text, "top_k": top_k},
+    )
+    return [(row.id, float(row.rank)) for row in result]
+
+
+async def _fetch_embedding_rows(
+    session: AsyncSession,
+    ids: list[int],
+) -> dict[int, dict[str, Any]]:
+    """Load content + metadata for the given embedding ids."""
+    if not ids:
+        return {}
+    sql = text("""
+        SELECT id, content, metadata
+        FROM embeddings
+        WHERE id = ANY(:ids)
+    """)
+    result = await session.execute(sql, {"ids": ids})
+    return {
+        row["id"]: {"content": row["content"] or "", "metadata": row["metadata"]}
+        for row in result.mappings()
+    }
+
+
 async def search_hybrid(
     session: AsyncSession,
     *,
@@ -319,6 +451,10 @@ async def search_hybrid(
     methods, where ``k=60`` (standard constant).  Weights are applied as
     multipliers so the caller can bias towards vector or keyword matches.
 
+    Both arms over the ``embeddings`` table return ids only; content and
+    metadata are fetched afterwards for the fused winners.  Vectorizer
+    chunks (a separate table) are small and come back inline.
+
     Args:
         project_id: restrict search to this project
         query_text: user's search query
@@ -332,62 +468,104 @@ async def search_hybrid(
         sorted by descending fused score.
     """
     RRF_K = 60  # standard RRF constant
+    fetch_k = top_k * 2  # over-fetch for better fusion
 
-    # Run both arms (vector needs AI; FTS does not)
-    vector_results = await search_similar(
-        session,
-        project_id=project_id,
-        query_text=query_text,
-        top_k=top_k * 2,  # over-fetch for better fusion
-        min_similarity=min_similarity,
-    )
-    fts_results = await search_fulltext(
-        session,
-        project_id=project_id,
-        query_text=query_text,
-        top_k=top_k * 2,
+    # Start the embedding API call now so its latency overlaps the FTS round-trip
+    embed_task = (
+        asyncio.create_task(generate_embedding(query_text))
+        if is_ai_configured()
+        else None
     )
 
-    # Build RRF score map   id → {"score", "content", "metadata", "sources"}
-    merged: dict[int, dict[str, Any]] = {}
-
-    for rank_pos, item in enumerate(vector_results):
-        eid = item["id"]
-        rrf = vector_weight / (RRF_K + rank_pos + 1)
-        if eid not in merged:
-            merged[eid] = {
-                "id": eid,
-                "content": item["content"],
-                "metadata": item["metadata"],
-                "score": 0.0,
-                "sources": [],
-            }
-        merged[eid]["score"] += rrf
-        merged[eid]["sources"].append("vector")
-
-    for rank_pos, item in enumerate(fts_results):
-        eid = item["id"]
-        rrf = fts_weight / (RRF_K + rank_pos + 1)
-        if eid not in merged:
-            merged[eid] = {
-                "id": eid,
-                "content": item["content"],
-                "metadata": item["metadata"],
-                "score": 0.0,
-                "sources": [],
-            }
-        merged[eid]["score"] += rrf
-        merged[eid]["sources"].append("fts")
+    # FTS arm
+    try:
+        fts_hits: list[tuple[_HitKey, float]] = [
+            (("embeddings", eid), rank)
+            for eid, rank in await _search_fulltext_ids(
+                session,
+                project_id=project_id,
+                query_text=query_text,
+                top_k=fetch_k,
+            )
+        ]
+    except BaseException:
+        if embed_task is not None:
+            embed_task.cancel()
+        raise
+
+    inline: dict[_HitKey, dict[str, Any]] = {}
+    vector_hits: list[tuple[_HitKey, float]] = []
+
+    # Vector arm (needs AI)
+    if embed_task is not None:
+        vec_str = vector_literal(await embed_task)
+        for item in await _search_vectorizer(
+            session,
+            project_id=project_id,
+            vec_str=vec_str,
+            top_k=fetch_k,
+            min_similarity=min_similarity,
+        ):
+            # One row per chunk, best first: keep only a message's best chunk
+            key = ("vectorizer", item["id"])
+            if key in inline:
+                continue
+            inline[key] = item
+            vector_hits.append((key, item["similarity"]))
+        vector_hits.extend(
+            (("embeddings", eid), sim)
+            for eid, sim in await _search_similar_ids(
+                session,
+                project_id=project_id,
+                vec_str=vec_str,
+                top_k=fetch_k,
+                min_similarity=min_similarity,
+            )
+        )
+        vector_hits.sort(key=lambda hit: hit[1], reverse=True)
+        del vector_hits[fetch_k:]
+
+    # RRF scores per key
+    scores: dict[_HitKey, float] = {}
+    sources: dict[_HitKey, list[str]] = {}
+    for arm, weight, hits in (
+        ("vector", vector_weight, vector_hits),
+        ("fts", fts_weight, fts_hits),
+    ):
+        for rank_pos, (key, _) in enumerate(hits):
+            scores[key] = scores.get(key, 0.0) + weight / (RRF_K + rank_pos + 1)
+            sources.setdefault(key, []).append(arm)
+
+    # Fetch content only for the best candidates (a few spare to cover
+    # duplicates of the same text stored in both tables)
+    candidates = sorted(scores, key=scores.__getitem__, reverse=True)[:fetch_k]
+    rows = await _fetch_embedding_rows(
+        session, [eid for table, eid in candidates if table == "embeddings"],
+    )
 
-    # Sort by fused score and trim
-    ranked = sorted(merged.values(), key=lambda x: x["score"], reverse=True)[:top_k]
+    ranked: list[dict[str, Any]] = []
+    seen_content: set[str] = set()
+    for key in candidates:
+        row = inline.get(key) if key[0] == "vectorizer" else rows.get(key[1])
+        if row is None or row["content"] in seen_content:
+            continue
+        seen_content.add(row["content"])
+        ranked.append({
+            "id": key[1],
+            "content": row["content"],
+            "metadata": row["metadata"],
+            "score": scores[key],
+            "sources": sources[key],
+        })
+        if len(ranked) == top_k:
+            break
 
     logger.debug(
         "Hybrid search: project_id=%d query='%s' → %d vec, %d fts → %d fused",
         project_id,
         query_text[:50],
-        len(vector_results),
-        len(fts_results),
+        len(vector_hits),
+        len(fts_hits),
         len(ranked),
     )
     return ranked
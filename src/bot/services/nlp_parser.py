@@ -17,15 +17,16 @@ Into structured data:
   }
 """
 
-import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import date, timedelta
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 from bot.services.ai_client import chat_completion, is_ai_configured
-from bot.services.skills_loader import get_skill_prompt
+from bot.services.skills_loader import get_skill_prompt, skills_generation
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +137,21 @@ _STAGE_PARSER_SCHEMA = """{
   "raw_summary": "string"
 }"""
 
+# User message is this prefix + the message text (built once, not per call)
+_PARSER_USER_PREFIX = (
+    "Извлеки структурированные данные из сообщения.\n\n"
+    f"Схема ответа:\n{_STAGE_PARSER_SCHEMA}\n\n"
+    "Сообщение:\n"
+)
+
+
+# Recently parsed messages, keyed by (skills generation, text) so a skills
+# reload invalidates them; entries expire after _PARSE_CACHE_TTL seconds so a
+# retried message gets a fresh parse.
+_PARSE_CACHE_SIZE = 256
+_PARSE_CACHE_TTL = 60.0
+_parse_cache: OrderedDict[tuple[int, str], tuple[float, ParsedMessage]] = OrderedDict()
+
 
 # ── Public API ────────────────────────────────────────────────
 
@@ -144,6 +160,11 @@ async def parse_message(text: str) -> ParsedMessage | None:
     """
     Parse a natural-language message and extract structured renovation data.
 
+    Successful results are kept briefly in a small LRU cache keyed by the
+    text and the current skills generation, so repeated parses of the same
+    message within _PARSE_CACHE_TTL seconds reuse one LLM call. Treat the
+    returned object as read-only.
+
     Returns None if AI is not configured.
     """
     if not is_ai_configured():
@@ -153,16 +174,17 @@ async def parse_message(text: str) -> ParsedMessage | None:
     if not text or not text.strip():
         return None
 
+    key = (skills_generation(), text)
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        if cached[0] >= time.monotonic():
+            _parse_cache.move_to_end(key)
+            return cached[1]
+        del _parse_cache[key]
+
     messages = [
         {"role": "system", "content": _get_parser_system_prompt()},
-        {
-            "role": "user",
-            "content": (
-                f"Извлеки структурированные данные из сообщения.\n\n"
-                f"Схема ответа:\n{_STAGE_PARSER_SCHEMA}\n\n"
-                f"Сообщение:\n{text}"
-            ),
-        },
+        {"role": "user", "content": _PARSER_USER_PREFIX + text},
     ]
 
     try:
@@ -172,14 +194,17 @@ async def parse_message(text: str) -> ParsedMessage | None:
             max_tokens=2000,
             response_format={"type": "json_object"},
         )
-        data = json.loads(raw)
-        parsed = ParsedMessage(**data)
+        # Decode + validate in one pass (pydantic-core), no intermediate dict
+        parsed = ParsedMessage.model_validate_json(raw)
         logger.info(
             "Parsed message: intent=%s, %d stages, %d expenses",
             parsed.intent, len(parsed.stages), len(parsed.expenses),
         )
+        _parse_cache[key] = (time.monotonic() + _PARSE_CACHE_TTL, parsed)
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
         return parsed
-    except (json.JSONDecodeError, Exception) as e:
+    except Exception as e:
         logger.error("Failed to parse NLP response: %s", e)
         return None
 
@@ -9,14 +9,17 @@ Also exposes a conversation-search helper that combines vector and
 full-text results over the *messages* table (not just embeddings).
 """
 
+import asyncio
 import logging
-from typing import Any
+from functools import lru_cache
+from typing import Any, Sequence
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.db import repositories as repo
+from bot.db.models import Message
 from bot.services.ai_client import chat_completion, is_ai_configured
-from bot.services.skills_loader import get_skill_prompt
+from bot.services.skills_loader import get_skill_prompt, skills_generation
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +36,38 @@ _PARTICIPANT_PROMPT_FALLBACK = (
 )
 
 
-def _get_participant_prompt() -> str:
+_DATE_FMT = "%d.%m.%Y %H:%M"
+
+# Cap on concurrent LLM calls when summarizing a whole project
+# (keeps bursts under the provider's requests-per-minute limit).
+_MAX_CONCURRENT_SUMMARIES = 8
+
+
+@lru_cache(maxsize=1)
+def _participant_prompt(generation: int) -> str:
     prompt = get_skill_prompt("participant-summary")
     if prompt:
         return prompt
     return _PARTICIPANT_PROMPT_FALLBACK
 
 
+def _get_participant_prompt() -> str:
+    # Keyed on the skills generation so a skills hot-reload is picked up
+    return _participant_prompt(skills_generation())
+
+
+def _format_conversation(messages: Sequence[Message]) -> str:
+    """Render messages as ``[date] [type] text`` lines for the LLM prompt."""
+    lines = []
+    for msg in messages:
+        date_str = msg.created_at.strftime(_DATE_FMT) if msg.created_at else ""
+        text = msg.transcribed_text or msg.raw_text or ""
+        msg_type = msg.message_type.value
+        type_tag = f"[{msg_type}]" if msg_type != "text" else ""
+        lines.append(f"[{date_str}] {type_tag} {text}")
+    return "\n".join(lines)
+
+
 async def summarize_participant(
     session: AsyncSession,
     *,
@@ -58,13 +86,12 @@ async def summarize_participant(
             "summary": str,  # AI-generated summary
         }
     """
-    grouped = await repo.get_messages_grouped_by_user(
-        session, project_id, limit_per_user=max_messages,
+    messages = await repo.get_messages_for_user(
+        session, project_id, user_id, limit=max_messages,
     )
-    messages = grouped.get(user_id, [])
 
-    # Get user name
-    user = await repo.get_user_by_id(session, user_id)
+    # Get user name (preloaded with the messages when there are any)
+    user = messages[0].user if messages else await repo.get_user_by_id(session, user_id)
     user_name = user.full_name if user else f"User #{user_id}"
 
     if not messages:
@@ -75,15 +102,7 @@ async def summarize_participant(
             "summary": "Нет сообщений от этого участника.",
         }
 
-    # Build message list for the LLM
-    lines = []
-    for msg in messages:
-        date_str = msg.created_at.strftime("%d.%m.%Y %H:%M") if msg.created_at else ""
-        text = msg.transcribed_text or msg.raw_text or ""
-        type_tag = f"[{msg.message_type.value}]" if msg.message_type.value != "text" else ""
-        lines.append(f"[{date_str}] {type_tag} {text}")
-
-    conversation_text = "\n".join(lines)
+    conversation_text = _format_conversation(messages)
 
     if not is_ai_configured():
         return {
@@ -134,20 +153,15 @@ async def summarize_all_participants(
     if not grouped:
         return []
 
-    results: list[dict[str, Any]] = []
+    # Build every participant's prompt first, then run the LLM calls
+    # concurrently (bounded by a semaphore) instead of one after another.
+    entries: list[tuple[int, str, int, list[dict[str, Any]] | None]] = []
     for uid, messages in grouped.items():
         user = messages[0].user if messages and messages[0].user else None
         user_name = user.full_name if user else f"User #{uid}"
+        conversation_text = _format_conversation(messages)
 
-        lines = []
-        for msg in messages:
-            date_str = msg.created_at.strftime("%d.%m.%Y %H:%M") if msg.created_at else ""
-            text = msg.transcribed_text or msg.raw_text or ""
-            type_tag = f"[{msg.message_type.value}]" if msg.message_type.value != "text" else ""
-            lines.append(f"[{date_str}] {type_tag} {text}")
-
-        conversation_text = "\n".join(lines)
-
+        prompt_messages = None
         if is_ai_configured():
             prompt_messages = [
                 {"role": "system", "content": _get_participant_prompt()},
@@ -160,16 +174,32 @@ async def summarize_all_participants(
                     ),
                 },
             ]
-            summary = await chat_completion(
+        entries.append((uid, user_name, len(messages), prompt_messages))
+
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SUMMARIES)
+
+    async def _summarize(prompt_messages: list[dict[str, Any]] | None) -> str:
+        if prompt_messages is None:
+            return "⚠️ AI не настроен — резюме недоступно."
+        async with semaphore:
+            return await chat_completion(
                 prompt_messages, temperature=0.3, max_tokens=1000,
             )
-        else:
-            summary = "⚠️ AI не настроен — резюме недоступно."
 
+    summaries = await asyncio.gather(
+        *(_summarize(prompt_messages) for _, _, _, prompt_messages in entries),
+        return_exceptions=True,
+    )
+
+    results: list[dict[str, Any]] = []
+    for (uid, user_name, message_count, _), summary in zip(entries, summaries):
+        if isinstance(summary, BaseException):
+            logger.error("Participant summary failed for user_id=%d: %s", uid, summary)
+            summary = "⚠️ Не удалось составить резюме."
         results.append({
             "user_id": uid,
             "user_name": user_name,
-            "message_count": len(messages),
+            "message_count": message_count,
             "summary": summary,
         })
 
@@ -4,6 +4,8 @@ PostgreSQL-native cache service.
 Uses an UNLOGGED table for fast key-value caching with TTL.
 UNLOGGED tables skip WAL writes (~10x faster), and data loss
 on crash is acceptable since it's regenerated on cache miss.
+With CACHE_L1_ENABLED, hot keys are also kept in a small in-process
+LRU for a few seconds, skipping the DB round-trip entirely.
 
 Also provides access to materialized views for expensive
 aggregation queries (budget summaries, stage progress).
@@ -17,6 +19,10 @@ Usage:
         data = await compute_budget(project_id=5)
         await pg_cache_set(session, "budget:5", data, ttl=300)
 
+    # Several keys in one round-trip
+    found = await pg_cache_get_many(session, ["user:tg:610379797", "project:chat:-100"])
+    await pg_cache_set_many(session, {"user:tg:610379797": 7, "project:chat:-100": 5})
+
     # Invalidate on data change
     await pg_cache_invalidate(session, "budget:5")
 
@@ -25,18 +31,63 @@ Usage:
     progress = await get_cached_stage_progress(session, project_id=5)
 """
 
-import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Any
 
+import orjson
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+# ── In-process L1 (optional, CACHE_L1_ENABLED) ───────────────
+
+# key → (monotonic expiry, value); insertion order doubles as LRU order.
+# Values are shared between callers, so they must be treated as read-only.
+_l1: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+
+def _l1_get(key: str) -> Any | None:
+    entry = _l1.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del _l1[key]
+        return None
+    _l1.move_to_end(key)
+    return entry[1]
+
+
+def _l1_put(key: str, value: Any) -> None:
+    _l1[key] = (time.monotonic() + settings.cache_l1_ttl, value)
+    _l1.move_to_end(key)
+    if len(_l1) > settings.cache_l1_size:
+        _l1.popitem(last=False)
+
+
+def _l1_evict(prefix: str) -> None:
+    for key in [k for k in _l1 if k.startswith(prefix)]:
+        del _l1[key]
+
+
 # ── Key-Value Cache (UNLOGGED table) ─────────────────────────
 
+# Statements are built once: the same TextClause objects hit SQLAlchemy's
+# compiled cache and the per-connection prepared-statement cache on every call.
+_GET_SQL = text("SELECT cache_get(:key)")
+_GET_MANY_SQL = text("SELECT key, value FROM cache_get_many(:keys)")
+_SET_SQL = text("SELECT cache_set(:key, CAST(:value AS jsonb), :ttl)")
+_SET_MANY_SQL = text(
+    "SELECT cache_set_many(:keys, CAST(:values AS jsonb[]), :ttl)"
+)
+_INVALIDATE_SQL = text("SELECT cache_invalidate(:prefix) AS count")
+_CLEANUP_SQL = text("SELECT cache_cleanup() AS count")
+
 
 async def pg_cache_get(
     session: AsyncSession,
@@ -47,18 +98,64 @@ async def pg_cache_get(
 
     The value is stored as JSONB and deserialized automatically.
     """
-    result = await session.execute(
-        text("SELECT cache_get(:key) AS value"),
-        {"key": key},
-    )
-    row = result.fetchone()
-    if row and row.value is not None:
+    if settings.cache_l1_enabled:
+        value = _l1_get(key)
+        if value is not None:
+            logger.debug("Cache L1 HIT: %s", key)
+            return value
+
+    # cache_get() returns a single JSONB value (NULL on miss)
+    value = (await session.execute(_GET_SQL, {"key": key})).scalar()
+    if value is not None:
         logger.debug("Cache HIT: %s", key)
-        return row.value
+        if settings.cache_l1_enabled:
+            _l1_put(key, value)
+        return value
     logger.debug("Cache MISS: %s", key)
     return None
 
 
+async def pg_cache_get_many(
+    session: AsyncSession,
+    keys: list[str],
+) -> dict[str, Any]:
+    """
+    Get several cached values in a single round-trip.
+
+    Returns a dict of key → value for the hits; missing or expired
+    keys are absent.
+    """
+    found: dict[str, Any] = {}
+    if settings.cache_l1_enabled:
+        for key in keys:
+            value = _l1_get(key)
+            if value is not None:
+                found[key] = value
+        missing = [key for key in keys if key not in found]
+    else:
+        missing = keys
+
+    if missing:
+        result = await session.execute(
+            _GET_MANY_SQL,
+            {"keys": missing},
+        )
+        for row in result:
+            if row.value is not None:
+                found[row.key] = row.value
+                if settings.cache_l1_enabled:
+                    _l1_put(row.key, row.value)
+
+    logger.debug("Cache GET_MANY: %d/%d hits", len(found), len(keys))
+    return found
+
+
+def _dumps(value: Any) -> str:
+    # One serialization pass; anything orjson can't encode natively
+    # (Decimal, custom objects) falls back to str()
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 async def pg_cache_set(
     session: AsyncSession,
     key: str,
@@ -73,17 +170,43 @@ async def pg_cache_set(
         value: any JSON-serializable value
         ttl: time-to-live in seconds (default: 5 minutes)
     """
-    # Convert Python objects to JSON-compatible format
-    if not isinstance(value, (dict, list, str, int, float, bool)):
-        value = json.loads(json.dumps(value, default=str, ensure_ascii=False))
-
     await session.execute(
-        text("SELECT cache_set(:key, CAST(:value AS jsonb), :ttl)"),
-        {"key": key, "value": json.dumps(value, ensure_ascii=False), "ttl": ttl},
+        _SET_SQL,
+        {"key": key, "value": _dumps(value), "ttl": ttl},
     )
+    # Repopulated from the stored (JSON-normalized) value on the next read
+    _l1.pop(key, None)
     logger.debug("Cache SET: %s (ttl=%ds)", key, ttl)
 
 
+async def pg_cache_set_many(
+    session: AsyncSession,
+    items: dict[str, Any],
+    ttl: int = 300,
+) -> None:
+    """
+    Set several cache entries with the same TTL in a single round-trip.
+
+    Args:
+        items: key → any JSON-serializable value
+        ttl: time-to-live in seconds (default: 5 minutes)
+    """
+    if not items:
+        return
+
+    await session.execute(
+        _SET_MANY_SQL,
+        {
+            "keys": list(items),
+            "values": [_dumps(value) for value in items.values()],
+            "ttl": ttl,
+        },
+    )
+    for key in items:
+        _l1.pop(key, None)
+    logger.debug("Cache SET_MANY: %d keys (ttl=%ds)", len(items), ttl)
+
+
 async def pg_cache_invalidate(
     session: AsyncSession,
     prefix: str,
@@ -96,12 +219,12 @@ async def pg_cache_invalidate(
         pg_cache_invalidate(session, "budget:")      — all budget caches
         pg_cache_invalidate(session, "user:610")     — one user
     """
+    _l1_evict(prefix)
     result = await session.execute(
-        text("SELECT cache_invalidate(:prefix) AS count"),
+        _INVALIDATE_SQL,
         {"prefix": prefix},
     )
-    row = result.fetchone()
-    count = row.count if row else 0
+    count = result.scalar() or 0
     if count:
         logger.debug("Cache INVALIDATE: %s (%d entries)", prefix, count)
     return count
@@ -109,9 +232,8 @@ async def pg_cache_invalidate(
 
 async def pg_cache_cleanup(session: AsyncSession) -> int:
     """Remove all expired cache entries. Returns count of removed entries."""
-    result = await session.execute(text("SELECT cache_cleanup() AS count"))
-    row = result.fetchone()
-    count = row.count if row else 0
+    result = await session.execute(_CLEANUP_SQL)
+    count = result.scalar() or 0
     if count:
         logger.info("Cache cleanup: removed %d expired entries", count)
     return count
@@ -147,6 +269,25 @@ async def cached(
 
 # ── Materialized Views ───────────────────────────────────────
 
+_BUDGET_SUMMARY_SQL = text("""
+    SELECT category,
+           total_work::float8 AS total_work,
+           total_materials::float8 AS total_materials,
+           total_prepayments::float8 AS total_prepayments,
+           total_spent::float8 AS total_spent,
+           item_count, confirmed_count
+    FROM mv_budget_summary
+    WHERE project_id = :project_id
+    ORDER BY category
+""")
+
+_STAGE_PROGRESS_SQL = text("""
+    SELECT total_stages, planned, in_progress, completed, delayed,
+           earliest_start, latest_end
+    FROM mv_stage_progress
+    WHERE project_id = :project_id
+""")
+
 
 async def get_cached_budget_summary(
     session: AsyncSession,
@@ -158,29 +299,12 @@ async def get_cached_budget_summary(
     Much faster than SUM/GROUP BY on every request.
     Data is refreshed by calling refresh_materialized_views().
     """
+    # Cast in SQL so the driver hands back floats instead of Decimals
     result = await session.execute(
-        text("""
-            SELECT category, total_work, total_materials,
-                   total_prepayments, total_spent,
-                   item_count, confirmed_count
-            FROM mv_budget_summary
-            WHERE project_id = :project_id
-            ORDER BY category
-        """),
+        _BUDGET_SUMMARY_SQL,
         {"project_id": project_id},
     )
-    return [
-        {
-            "category": row.category,
-            "total_work": float(row.total_work),
-            "total_materials": float(row.total_materials),
-            "total_prepayments": float(row.total_prepayments),
-            "total_spent": float(row.total_spent),
-            "item_count": row.item_count,
-            "confirmed_count": row.confirmed_count,
-        }
-        for row in result.fetchall()
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 async def get_cached_stage_progress(
@@ -193,32 +317,27 @@ async def get_cached_stage_progress(
     Returns counts of planned/in_progress/completed/delayed stages.
     """
     result = await session.execute(
-        text("""
-            SELECT total_stages, planned, in_progress, completed, delayed,
-                   earliest_start, latest_end
-            FROM mv_stage_progress
-            WHERE project_id = :project_id
-        """),
+        _STAGE_PROGRESS_SQL,
         {"project_id": project_id},
     )
-    row = result.fetchone()
+    row = result.mappings().first()
     if not row:
         return None
 
-    return {
-        "total_stages": row.total_stages,
-        "planned": row.planned,
-        "in_progress": row.in_progress,
-        "completed": row.completed,
-        "delayed": row.delayed,
-        "earliest_start": str(row.earliest_start) if row.earliest_start else None,
-        "latest_end": str(row.latest_end) if row.latest_end else None,
-    }
+    progress = dict(row)
+    # str(datetime) keeps the "+00:00" form regardless of session TimeZone
+    for field in ("earliest_start", "latest_end"):
+        if progress[field]:
+            progress[field] = str(progress[field])
+    return progress
 
 
 async def refresh_views(session: AsyncSession) -> None:
     """
-    Refresh all materialized views.
+    Refresh materialized views whose source tables have changed.
+
+    Triggers on budget_items/stages log the affected view, so a call
+    with no pending changes does no work.
 
     Call this after data changes (new expense, stage status update, etc.)
     or on a periodic schedule (e.g., every 60 seconds via the scheduler).
@@ -23,22 +23,26 @@ Usage:
     )
 """
 
-import json
 import logging
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config import settings
+from bot.services.embedding_service import vector_literal
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def _get_embed_function_sql() -> str:
     """
     Return the pgai SQL function call for embedding based on AI_PROVIDER.
 
+    Settings don't change at runtime, so the result is memoized.
+
     For OpenAI/Azure/compatible:
         ai.openai_embed(model, text, base_url, api_key, dimensions)
     For Ollama:
@@ -85,6 +89,30 @@ def _get_embed_function_sql() -> str:
         return ""
 
 
+@lru_cache(maxsize=1)
+def _get_embed_and_search_stmt() -> TextClause:
+    """Build the embed + search statement once for the configured provider."""
+    embed_fn = _get_embed_function_sql()
+    return text(f"""
+        WITH query_embedding AS (
+            SELECT CAST({embed_fn} AS halfvec) AS vec
+        ),
+        nearest AS (
+            SELECT
+                e.id, e.content, e.metadata,
+                e.embedding <=> q.vec AS distance
+            FROM embeddings e, query_embedding q
+            WHERE e.project_id = :project_id
+            ORDER BY e.embedding <=> q.vec
+            LIMIT :top_k
+        )
+        SELECT id, content, metadata, 1 - distance AS similarity
+        FROM nearest
+        WHERE distance <= :max_dist
+        ORDER BY distance
+    """)
+
+
 async def pgai_search(
     session: AsyncSession,
     *,
@@ -100,35 +128,35 @@ async def pgai_search(
     (e.g., via ai_client.generate_embedding) and you want to
     search using pgvector's cosine distance.
     """
-    vec_str = "[" + ",".join(str(v) for v in query_embedding) + "]"
+    vec_str = vector_literal(query_embedding)
 
+    # Take the top_k nearest first, then apply the similarity floor: a
+    # distance predicate in the inner WHERE would stop a vector index
+    # from serving the ORDER BY ... LIMIT scan.
     sql = text("""
-        SELECT
-            id, content, metadata AS metadata_,
-            1 - (embedding <=> CAST(:query_vec AS vector)) AS similarity
-        FROM embeddings
-        WHERE project_id = :project_id
-          AND 1 - (embedding <=> CAST(:query_vec AS vector)) >= :min_sim
-        ORDER BY embedding <=> CAST(:query_vec AS vector)
-        LIMIT :top_k
+        WITH nearest AS (
+            SELECT
+                id, content, metadata,
+                embedding <=> CAST(:query_vec AS halfvec) AS distance
+            FROM embeddings
+            WHERE project_id = :project_id
+            ORDER BY embedding <=> CAST(:query_vec AS halfvec)
+            LIMIT :top_k
+        )
+        SELECT id, content, metadata, 1 - distance AS similarity
+        FROM nearest
+        WHERE distance <= :max_dist
+        ORDER BY distance
     """)
 
     result = await session.execute(sql, {
         "query_vec": vec_str,
         "project_id": project_id,
-        "min_sim": min_similarity,
+        "max_dist": 1 - min_similarity,
         "top_k": top_k,
     })
 
-    return [
-        {
-            "id": row.id,
-            "content": row.content,
-            "metadata": json.loads(row.metadata_) if row.metadata_ else None,
-            "similarity": float(row.similarity),
-        }
-        for row in result.fetchall()
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 async def pgai_embed_and_search(
@@ -149,9 +177,7 @@ async def pgai_embed_and_search(
     Falls back to Python-side embedding if pgai SQL embedding is not
     available (e.g., Azure Entra ID auth).
     """
-    embed_fn = _get_embed_function_sql()
-
-    if not embed_fn:
+    if not _get_embed_function_sql():
         # Fall back to Python-side embedding + search
         from bot.services.embedding_service import search_similar
         return await search_similar(
@@ -160,36 +186,16 @@ async def pgai_embed_and_search(
             min_similarity=min_similarity,
         )
 
-    sql = text(f"""
-        WITH query_embedding AS (
-            SELECT {embed_fn} AS vec
-        )
-        SELECT
-            e.id, e.content, e.metadata AS metadata_,
-            1 - (e.embedding <=> q.vec) AS similarity
-        FROM embeddings e, query_embedding q
-        WHERE e.project_id = :project_id
-          AND 1 - (e.embedding <=> q.vec) >= :min_sim
-        ORDER BY e.embedding <=> q.vec
-        LIMIT :top_k
-    """)
+    sql = _get_embed_and_search_stmt()
 
     result = await session.execute(sql, {
         "query_text": query_text,
         "project_id": project_id,
-        "min_sim": min_similarity,
+        "max_dist": 1 - min_similarity,
         "top_k": top_k,
     })
 
-    return [
-        {
-            "id": row.id,
-            "content": row.content,
-            "metadata": json.loads(row.metadata_) if row.metadata_ else None,
-            "similarity": float(row.similarity),
-        }
-        for row in result.fetchall()
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 async def pgai_chat(
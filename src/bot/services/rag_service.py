@@ -10,14 +10,17 @@ This gives the bot "memory" — it can answer questions about the project
 based on chat history, stage data, and budget information.
 """
 
+import hashlib
 import logging
+from functools import lru_cache
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.core.budget_service import CATEGORY_LABELS
 from bot.services.ai_client import chat_completion, is_ai_configured
 from bot.services.embedding_service import search_hybrid, search_similar
-from bot.services.skills_loader import get_skill_prompt
+from bot.services.skills_loader import get_skill_prompt, skills_generation
 
 logger = logging.getLogger(__name__)
 
@@ -46,8 +49,8 @@ _RAG_SYSTEM_PROMPT_FALLBACK = (
 )
 
 
-def _get_rag_system_prompt() -> str:
-    """Load RAG system prompt from skill file, falling back to built-in."""
+@lru_cache(maxsize=1)
+def _rag_system_prompt(generation: int) -> str:
     prompt = get_skill_prompt("rag-assistant")
     if prompt:
         return prompt
@@ -55,6 +58,12 @@ def _get_rag_system_prompt() -> str:
     return _RAG_SYSTEM_PROMPT_FALLBACK
 
 
+def _get_rag_system_prompt() -> str:
+    """Load RAG system prompt from skill file, falling back to built-in."""
+    # Keyed on the skills generation so a skills hot-reload is picked up
+    return _rag_system_prompt(skills_generation())
+
+
 # ── Public API ────────────────────────────────────────────────
 
 
@@ -79,9 +88,12 @@ async def ask_project(
         )
 
     # Check cache for recent identical question
-    import hashlib
     from bot.services.pg_cache import pg_cache_get, pg_cache_set
-    q_hash = hashlib.md5(question.lower().strip().encode()).hexdigest()[:12]
+    # Collapse whitespace once; search and the prompt get this question
+    # in its original case. Only the cache key is lowercased, so questions
+    # differing in spacing or case share a cache entry.
+    question = " ".join(question.split())
+    q_hash = hashlib.blake2b(question.lower().encode(), digest_size=6).hexdigest()
     cache_key = f"ask:{project_id}:{q_hash}"
 
     cached_answer = await pg_cache_get(session, cache_key)
@@ -197,37 +209,38 @@ def build_project_context(
         )
 
     # Per-category expense breakdown
-    from bot.core.budget_service import CATEGORY_LABELS
+    cat_label = CATEGORY_LABELS.get
 
     cat_summaries = project_data.get("category_summaries", [])
     if cat_summaries:
-        cat_lines = ["Расходы по категориям:"]
-        for cs in cat_summaries:
-            cat_name = CATEGORY_LABELS.get(cs["category"], cs["category"])
-            cat_lines.append(
-                f"  {cat_name}: работа {cs['work']:.0f}, "
-                f"материалы {cs['materials']:.0f}, "
-                f"итого {cs['total']:.0f}"
-            )
-        parts.append("\n".join(cat_lines))
+        parts.append("Расходы по категориям:\n" + "\n".join(
+            f"  {cat_label(cs['category'], cs['category'])}: "
+            f"работа {cs['work']:.0f}, "
+            f"материалы {cs['materials']:.0f}, "
+            f"итого {cs['total']:.0f}"
+            for cs in cat_summaries
+        ))
 
     # Individual budget items (expense descriptions)
     budget_items = project_data.get("budget_items", [])
     if budget_items:
         item_lines = ["Список расходов:"]
         for bi in budget_items:
-            cat_name = CATEGORY_LABELS.get(bi.category, bi.category)
-            desc = bi.description or "без описания"
+            work, materials, prepayment = (
+                float(bi.work_cost), float(bi.material_cost), float(bi.prepayment)
+            )
             amounts = []
-            if float(bi.work_cost) > 0:
-                amounts.append(f"работа {float(bi.work_cost):.0f}")
-            if float(bi.material_cost) > 0:
-                amounts.append(f"материалы {float(bi.material_cost):.0f}")
-            if float(bi.prepayment) > 0:
-                amounts.append(f"предоплата {float(bi.prepayment):.0f}")
+            if work > 0:
+                amounts.append(f"работа {work:.0f}")
+            if materials > 0:
+                amounts.append(f"материалы {materials:.0f}")
+            if prepayment > 0:
+                amounts.append(f"предоплата {prepayment:.0f}")
             confirmed = "подтверждён" if bi.is_confirmed else "не подтверждён"
             item_lines.append(
-                f"  • {cat_name} — {desc}: {', '.join(amounts)} ({confirmed})"
+                f"  • {cat_label(bi.category, bi.category)} — "
+                f"{bi.description or 'без описания'}: "
+                f"{', '.join(amounts)} ({confirmed})"
             )
         parts.append("\n".join(item_lines))
 
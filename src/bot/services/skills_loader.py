@@ -31,21 +31,35 @@ Usage:
 """
 
 import logging
+import os
 import re
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Any
+from functools import lru_cache
+from typing import Any, BinaryIO
 
 import yaml
 
 logger = logging.getLogger(__name__)
 
+# libyaml bindings when available — much faster than the pure-Python loader
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Module-level skill registry
 _skills: dict[str, "Skill"] = {}
 _loaded = False
+_generation = 0  # bumped on every (re)load; keys prompt caches in callers
+_skills_xml = ""  # format_skills_for_prompt() output, rebuilt on (re)load
+# (discovered paths, their (mtime, size) stamps) as of the last load
+_fingerprint: tuple[tuple[str, ...], tuple[tuple[int, int] | None, ...]] = ((), ())
+# source_path → ((st_mtime_ns, st_size), parsed Skill or None); lets a
+# reload skip reading and parsing files that haven't changed
+_parse_cache: dict[str, tuple[tuple[int, int], "Skill | None"]] = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     """
     A loaded skill definition.
@@ -53,17 +67,24 @@ class Skill:
     Mirrors OpenClaw's AgentSkills format:
       - name: unique identifier
       - description: short description for token-efficient listing
-      - instructions: full prompt text (the body of SKILL.md)
+      - instructions: full prompt text (the body of SKILL.md),
+        read from source_path on first access
       - priority: load order (higher = loaded later, overrides earlier)
       - metadata: optional extra fields from frontmatter
       - source_path: where this skill was loaded from
     """
     name: str
     description: str = ""
-    instructions: str = ""
     priority: int = 0
     metadata: dict[str, Any] = field(default_factory=dict)
     source_path: str = ""
+    _instructions: str | None = None
+
+    @property
+    def instructions(self) -> str:
+        if self._instructions is None:
+            self._instructions = _read_instructions(self.source_path)
+        return self._instructions
 
     def __repr__(self) -> str:
         return f"Skill(name={self.name!r}, priority={self.priority}, source={self.source_path!r})"
@@ -71,16 +92,179 @@ class Skill:
 
 # ── YAML frontmatter parser ──────────────────────────────────
 
-_FRONTMATTER_RE = re.compile(
-    r"^---\s*\n(.*?)\n---\s*\n(.*)$",
-    re.DOTALL,
-)
+# Metadata-only reads start with this much of the file; frontmatter
+# virtually always fits, so the body is never read
+_FRONTMATTER_HEAD_BYTES = 4096
+
+
+def _find_frontmatter(data: bytes, complete: bool) -> tuple[int, int, int] | None:
+    """
+    Locate the frontmatter in raw file bytes.
+
+    The data must start with a ``---`` line; the frontmatter runs to the
+    next ``---`` line.  Returns ``(start, end, body_start)`` offsets, or
+    None if not found (in a partial read: not found *yet*).
+    """
+    first_end = data.find(b"\n")
+    if first_end == -1 or data[:first_end].rstrip() != b"---":
+        return None
+
+    start = first_end + 1
+    pos = first_end
+    while (pos := data.find(b"\n---", pos)) != -1:
+        line_start = pos + 1
+        line_end = data.find(b"\n", line_start)
+        if line_end == -1:
+            if not complete:
+                return None  # the closing line may continue past the read
+            line_end = len(data)
+        if data[line_start:line_end].rstrip() == b"---":
+            return start, line_start, line_end + 1
+        pos = line_end
+    return None
+
+
+def _split_frontmatter(f: BinaryIO, metadata_only: bool) -> tuple[str, str] | None:
+    """
+    Split a SKILL.md opened in binary mode into ``(frontmatter, body)``.
+
+    Delimiters are located with bytes.find and only the frontmatter (and,
+    unless ``metadata_only``, the body) is decoded; with ``metadata_only``
+    the body is returned empty.  Returns None if there is no frontmatter.
+    """
+    if metadata_only:
+        data = f.read(_FRONTMATTER_HEAD_BYTES)
+        span = _find_frontmatter(data, complete=len(data) < _FRONTMATTER_HEAD_BYTES)
+        if span is None and len(data) == _FRONTMATTER_HEAD_BYTES:
+            data += f.read()
+            span = _find_frontmatter(data, complete=True)
+    else:
+        data = f.read()
+        span = _find_frontmatter(data, complete=True)
+
+    if span is None:
+        return None
+
+    start, end, body_start = span
+    frontmatter = data[start:end].decode("utf-8")
+    if metadata_only:
+        return frontmatter, ""
+
+    body = data[body_start:].decode("utf-8")
+    if "\r" in body:  # match text-mode newline translation
+        body = body.replace("\r\n", "\n").replace("\r", "\n")
+    return frontmatter, body.strip()
+
+
+# ── Flat frontmatter fast path ───────────────────────────────
+#
+# Skill frontmatter is a few scalar keys plus an optional one-level map
+# (``metadata:``).  That shape is parsed directly; anything the fast path
+# isn't certain to read exactly like YAML returns None and goes through
+# the YAML loader instead.
+
+_FLAT_LINE_RE = re.compile(r"( *)([A-Za-z_][\w-]*):(?: +(.*?))? *")
+_FLAT_PLAIN_RE = re.compile(r"[^\W\d][\w -]*")
+_FLAT_INT_RE = re.compile(r"0|-?[1-9][0-9]*")
+_FLAT_BOOLS = {"true": True, "True": True, "TRUE": True,
+               "false": False, "False": False, "FALSE": False}
+# Plain words YAML 1.1 resolves to something other than a string
+_YAML_SPECIAL_WORDS = frozenset({
+    "null", "Null", "NULL", "yes", "Yes", "YES", "no", "No", "NO",
+    "on", "On", "ON", "off", "Off", "OFF",
+})
+_UNPARSED = object()
+
+
+def _flat_scalar(raw: str) -> Any:
+    if not raw:
+        return _UNPARSED
+    if raw in _FLAT_BOOLS:
+        return _FLAT_BOOLS[raw]
+    if _FLAT_INT_RE.fullmatch(raw):
+        return int(raw)
+    quote = raw[0]
+    if quote in "\"'":
+        inner = raw[1:-1]
+        if len(raw) >= 2 and raw[-1] == quote and quote not in inner and "\\" not in inner:
+            return inner
+        return _UNPARSED
+    if raw not in _YAML_SPECIAL_WORDS and _FLAT_PLAIN_RE.fullmatch(raw):
+        return raw
+    return _UNPARSED
+
+
+def _flat_value(raw: str) -> Any:
+    if raw[0] == "[" and raw[-1] == "]":
+        inner = raw[1:-1].strip()
+        items = [_flat_scalar(item.strip()) for item in inner.split(",")] if inner else []
+        return _UNPARSED if _UNPARSED in items else items
+    return _flat_scalar(raw)
+
+
+def _parse_flat_frontmatter(text: str) -> dict[str, Any] | None:
+    """
+    Parse ``key: value`` frontmatter with at most one level of nesting.
+
+    Returns None if any line falls outside that subset.
+    """
+    result: dict[str, Any] = {}
+    nested: dict[str, Any] | None = None
+    nested_indent = 0
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            continue
+        match = _FLAT_LINE_RE.fullmatch(line)
+        if match is None:
+            return None
+        indent, key, raw = len(match[1]), match[2], match[3] or None
+
+        if indent:
+            if nested is None or (nested_indent and indent != nested_indent):
+                return None
+            nested_indent = indent
+            if raw is None:
+                return None  # deeper nesting
+            target = nested
+        else:
+            target = result
+            if raw is None:
+                nested = result[key] = {}
+                nested_indent = 0
+                continue
+            nested = None
+
+        value = _flat_value(raw)
+        if value is _UNPARSED:
+            return None
+        target[key] = value
+
+    # A key with no value and no children is null in YAML
+    return {k: None if v == {} else v for k, v in result.items()}
 
 
-def parse_skill_file(path: Path) -> Skill | None:
+def _read_instructions(path: str) -> str:
+    """Load the instruction body of a skill file (lazy second phase)."""
+    try:
+        with open(path, "rb") as f:
+            parts = _split_frontmatter(f, metadata_only=False)
+    except Exception as e:
+        logger.warning("Cannot read skill file %s: %s", path, e)
+        return ""
+
+    return parts[1] if parts else ""
+
+
+def parse_skill_file(path: str | os.PathLike[str], metadata_only: bool = True) -> Skill | None:
     """
     Parse a SKILL.md file into a Skill object.
 
+    With ``metadata_only`` (the default) only the frontmatter is read;
+    the instruction body is loaded on first access to
+    ``Skill.instructions``.
+
     Expected format:
         ---
         name: skill-name
@@ -95,24 +279,25 @@ def parse_skill_file(path: Path) -> Skill | None:
     Returns None if the file cannot be parsed.
     """
     try:
-        text = path.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            parts = _split_frontmatter(f, metadata_only)
     except Exception as e:
         logger.warning("Cannot read skill file %s: %s", path, e)
         return None
 
-    match = _FRONTMATTER_RE.match(text)
-    if not match:
+    if parts is None:
         logger.warning("No YAML frontmatter in %s", path)
         return None
 
-    frontmatter_text = match.group(1)
-    body = match.group(2).strip()
+    frontmatter_text, body = parts
 
-    try:
-        fm = yaml.safe_load(frontmatter_text) or {}
-    except yaml.YAMLError as e:
-        logger.warning("Invalid YAML in %s: %s", path, e)
-        return None
+    fm = _parse_flat_frontmatter(frontmatter_text)
+    if fm is None:
+        try:
+            fm = yaml.load(frontmatter_text, Loader=_YamlLoader) or {}
+        except yaml.YAMLError as e:
+            logger.warning("Invalid YAML in %s: %s", path, e)
+            return None
 
     name = fm.get("name")
     if not name:
@@ -120,31 +305,102 @@ def parse_skill_file(path: Path) -> Skill | None:
         return None
 
     return Skill(
-        name=name,
+        # Interned: names are dict keys looked up on every prompt build
+        name=sys.intern(str(name)),
         description=fm.get("description", ""),
-        instructions=body,
         priority=int(fm.get("priority", 0)),
         metadata=fm.get("metadata", {}),
         source_path=str(path),
+        _instructions=None if metadata_only else body,
     )
 
 
 # ── Directory scanning ────────────────────────────────────────
 
 
-def _discover_skill_files(directory: Path) -> list[Path]:
+def _scandir_recursive(path: str) -> Iterator[str]:
+    """
+    Yield paths of SKILL.md files under ``path``.
+
+    Uses os.scandir so file-type checks come from the cached directory
+    entry instead of a stat() per entry.  Symlinks are not followed.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+                elif entry.name == "SKILL.md" and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+    except PermissionError as e:
+        logger.warning("Cannot scan skills directory %s: %s", path, e)
+
+
+def _discover_skill_files(directory: str) -> list[str]:
     """Find all SKILL.md files in a directory (recursive)."""
-    if not directory.is_dir():
+    if not os.path.isdir(directory):
         return []
 
-    results: list[Path] = []
-    for skill_file in directory.rglob("SKILL.md"):
-        results.append(skill_file)
+    return sorted(_scandir_recursive(directory))
+
+
+# Files are tiny and reads release the GIL, so a handful of threads
+# overlaps the I/O on a cold start; below this many files it isn't worth it
+_PARALLEL_PARSE_MIN_FILES = 4
+_PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _stat_skill_files(paths: list[str]) -> list[tuple[int, int] | None]:
+    """(st_mtime_ns, st_size) per file, or None if it can't be stat'ed."""
+    stamps: list[tuple[int, int] | None] = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamps.append(None)  # parse_skill_file logs the read error
+        else:
+            stamps.append((st.st_mtime_ns, st.st_size))
+    return stamps
+
+
+def _parse_skill_files(
+    paths: list[str],
+    stamps: list[tuple[int, int] | None],
+) -> list[Skill | None]:
+    """
+    Parse skill files, returning results in the order of ``paths``.
+
+    Files unchanged since the last load (same stamp) reuse the cached
+    result; the rest are parsed, in parallel when there are enough.
+    """
+    todo = list(dict.fromkeys(
+        path for path, stamp in zip(paths, stamps)
+        if stamp is None or (cached := _parse_cache.get(path)) is None or cached[0] != stamp
+    ))
+
+    if len(todo) >= _PARALLEL_PARSE_MIN_FILES and _PARSE_WORKERS > 1:
+        with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as pool:
+            parsed = dict(zip(todo, pool.map(parse_skill_file, todo)))
+    else:
+        parsed = {path: parse_skill_file(path) for path in todo}
+
+    for path, stamp in zip(paths, stamps):
+        if path in parsed and stamp is not None:
+            _parse_cache[path] = (stamp, parsed[path])
+
+    return [parsed[path] if path in parsed else _parse_cache[path][1] for path in paths]
 
-    return sorted(results)
 
+# Paths stay plain strings throughout the loader — no pathlib objects
+# are built per directory or per file
+_BOT_DIR = os.path.dirname(os.path.dirname(__file__))
+_BUILTIN_SKILLS_DIR = os.path.join(_BOT_DIR, "skills")
+_ROOT_SKILLS_DIR = os.path.join(os.path.dirname(os.path.dirname(_BOT_DIR)), "skills")
 
-def _get_skill_directories() -> list[Path]:
+
+def _get_skill_directories() -> list[str]:
     """
     Return skill directories in precedence order (lowest first).
 
@@ -153,26 +409,30 @@ def _get_skill_directories() -> list[Path]:
     """
     from bot.config import settings
 
-    dirs: list[Path] = []
+    return list(_skill_directories(settings.skills_dir))
+
+
+@lru_cache(maxsize=1)
+def _skill_directories(skills_dir: str) -> tuple[str, ...]:
+    # Cached per SKILLS_DIR value; reload_skills() clears it so newly
+    # created directories are picked up
+    dirs: list[str] = []
 
     # Built-in skills directory
-    builtin_dir = Path(__file__).parent.parent / "skills"
-    if builtin_dir.is_dir():
-        dirs.append(builtin_dir)
+    if os.path.isdir(_BUILTIN_SKILLS_DIR):
+        dirs.append(_BUILTIN_SKILLS_DIR)
 
     # Project root skills/ fallback
-    project_root = Path(__file__).parent.parent.parent.parent
-    root_skills = project_root / "skills"
-    if root_skills.is_dir() and root_skills != builtin_dir:
-        dirs.append(root_skills)
+    if os.path.isdir(_ROOT_SKILLS_DIR) and _ROOT_SKILLS_DIR != _BUILTIN_SKILLS_DIR:
+        dirs.append(_ROOT_SKILLS_DIR)
 
     # Custom skills directory from config
-    if settings.skills_dir:
-        custom = Path(settings.skills_dir)
-        if custom.is_dir() and custom not in dirs:
+    if skills_dir:
+        custom = os.path.normpath(skills_dir)
+        if os.path.isdir(custom) and custom not in dirs:
             dirs.append(custom)
 
-    return dirs
+    return tuple(dirs)
 
 
 # ── Public API ───────────────────────────────────────────────
@@ -182,9 +442,9 @@ def load_skills(force: bool = False) -> dict[str, Skill]:
     """
     Load all skills from all skill directories.
 
-    Skills are loaded in precedence order — later directories
-    override earlier ones (same name). Within a directory,
-    higher priority wins.
+    Skills are merged by name: the higher ``priority`` wins, and on
+    equal priority a later directory (or later file) overrides an
+    earlier one.
 
     Args:
         force: reload even if already loaded.
@@ -192,7 +452,7 @@ def load_skills(force: bool = False) -> dict[str, Skill]:
     Returns:
         Dict of name → Skill.
     """
-    global _skills, _loaded
+    global _skills, _loaded, _generation, _skills_xml, _fingerprint
 
     if _loaded and not force:
         return _skills
@@ -200,33 +460,55 @@ def load_skills(force: bool = False) -> dict[str, Skill]:
     all_skills: dict[str, Skill] = {}
     dirs = _get_skill_directories()
 
-    for skill_dir in dirs:
-        files = _discover_skill_files(skill_dir)
-        for skill_file in files:
-            skill = parse_skill_file(skill_file)
-            if skill is None:
-                continue
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    files = [f for skill_dir in dirs for f in _discover_skill_files(skill_dir)]
+    stamps = _stat_skill_files(files)
 
-            existing = all_skills.get(skill.name)
-            if existing and existing.priority > skill.priority:
+    # Nothing added, removed or modified since the last load: keep the
+    # current registry (and its generation, so callers' caches stay valid)
+    fingerprint = (tuple(files), tuple(stamps))
+    if _loaded and fingerprint == _fingerprint:
+        logger.debug("Skills unchanged, keeping %d loaded skills", len(_skills))
+        return _skills
+
+    # Parse everything up front (possibly in parallel), then merge in
+    # directory precedence order
+    for skill in _parse_skill_files(files, stamps):
+        if skill is None:
+            continue
+
+        # Not a plain setdefault over reversed directories: priority must
+        # still be able to beat directory precedence
+        existing = all_skills.get(skill.name)
+        if existing and existing.priority > skill.priority:
+            if debug:
                 logger.debug(
                     "Skipping %s from %s (lower priority than %s)",
                     skill.name, skill.source_path, existing.source_path,
                 )
-                continue
+            continue
 
-            all_skills[skill.name] = skill
+        all_skills[skill.name] = skill
+        if debug:
             logger.debug("Loaded skill: %s from %s", skill.name, skill.source_path)
 
+    for stale in _parse_cache.keys() - set(files):
+        del _parse_cache[stale]
+
+    _fingerprint = fingerprint
     _skills = all_skills
+    _skills_xml = _build_skills_xml(all_skills)
     _loaded = True
+    _generation += 1
 
     logger.info(
         "Skills loaded: %d skills from %d directories",
         len(_skills), len(dirs),
     )
-    for skill in sorted(_skills.values(), key=lambda s: s.priority):
-        logger.debug("  [%d] %s — %s", skill.priority, skill.name, skill.description)
+    if debug:
+        for skill in sorted(_skills.values(), key=lambda s: s.priority):
+            logger.debug("  [%d] %s — %s", skill.priority, skill.name, skill.description)
 
     return _skills
 
@@ -238,15 +520,30 @@ def get_all_skills() -> dict[str, Skill]:
     return _skills
 
 
+def skills_generation() -> int:
+    """
+    Return a counter that changes every time skills are (re)loaded.
+
+    Callers that cache values derived from skills pass this as a cache
+    key so a hot-reload invalidates them.
+    """
+    if not _loaded:
+        load_skills()
+    return _generation
+
+
+# The lookups below inline the load-on-first-use check rather than going
+# through get_all_skills(): they run on every prompt build.
+
+
 def get_skill(name: str) -> Skill | None:
     """Get a skill by name."""
-    skills = get_all_skills()
-    return skills.get(name)
+    return (_skills if _loaded else load_skills()).get(name)
 
 
 def get_skill_prompt(name: str) -> str | None:
     """Get just the instruction text of a skill by name."""
-    skill = get_skill(name)
+    skill = (_skills if _loaded else load_skills()).get(name)
     return skill.instructions if skill else None
 
 
@@ -259,15 +556,33 @@ def get_combined_system_prompt(*skill_names: str) -> str:
     Example:
         prompt = get_combined_system_prompt("rag-assistant", "budget-analysis")
     """
-    parts: list[str] = []
-    for name in skill_names:
-        skill = get_skill(name)
-        if skill:
-            parts.append(f"=== {skill.description or skill.name} ===\n{skill.instructions}")
-        else:
-            logger.warning("Skill '%s' not found", name)
+    skills = get_all_skills()
+    prompt = "\n\n".join(
+        f"=== {skill.description or skill.name} ===\n{skill.instructions}"
+        for name in skill_names
+        if (skill := skills.get(name)) is not None
+    )
+
+    missing = [name for name in skill_names if name not in skills]
+    if missing:
+        logger.warning("Skills not found: %s", ", ".join(missing))
+
+    return prompt
 
-    return "\n\n".join(parts)
+
+_XML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+def _build_skills_xml(skills: dict[str, Skill]) -> str:
+    if not skills:
+        return ""
+
+    lines = "\n".join(
+        f"  <skill><name>{skill.name.translate(_XML_ESCAPE)}</name>"
+        f"<description>{skill.description.translate(_XML_ESCAPE)}</description></skill>"
+        for skill in sorted(skills.values(), key=lambda s: (s.priority, s.name))
+    )
+    return f"<available_skills>\n{lines}\n</available_skills>"
 
 
 def format_skills_for_prompt() -> str:
@@ -275,28 +590,17 @@ def format_skills_for_prompt() -> str:
     Format all loaded skills into an XML listing for the system prompt.
 
     Mirrors OpenClaw's formatSkillsForPrompt — a token-efficient listing
-    of available skills injected into the model context.
+    of available skills injected into the model context.  The listing is
+    built once per (re)load.
 
     Returns:
         XML string listing all skills (or empty string if none loaded).
     """
-    skills = get_all_skills()
-    if not skills:
-        return ""
-
-    parts = ["<available_skills>"]
-    for skill in sorted(skills.values(), key=lambda s: (s.priority, s.name)):
-        name_esc = skill.name.replace("&", "&amp;").replace("<", "&lt;")
-        desc_esc = skill.description.replace("&", "&amp;").replace("<", "&lt;")
-        parts.append(
-            f"  <skill><name>{name_esc}</name>"
-            f"<description>{desc_esc}</description></skill>"
-        )
-    parts.append("</available_skills>")
-
-    return "\n".join(parts)
+    get_all_skills()
+    return _skills_xml
 
 
 def reload_skills() -> dict[str, Skill]:
     """Force-reload all skills (useful for hot-reload or testing)."""
+    _skill_directories.cache_clear()
     return load_skills(force=True)
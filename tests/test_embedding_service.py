@@ -0,0 +1,42 @@
+"""Tests for hybrid search fusion in the embedding service."""
+
+from bot.services import embedding_service
+
+
+async def test_hybrid_keeps_only_best_vectorizer_chunk_per_message(monkeypatch):
+    """Several chunks of one message count once, with the best chunk's content."""
+
+    async def fake_embedding(_text):
+        return [0.1, 0.2]
+
+    async def no_hits(*_args, **_kwargs):
+        return []
+
+    async def no_rows(*_args, **_kwargs):
+        return {}
+
+    async def vectorizer_hits(*_args, **_kwargs):
+        # Ordered by similarity, as the query returns them
+        return [
+            {"id": 1, "content": "best chunk", "metadata": None, "similarity": 0.9},
+            {"id": 2, "content": "other message", "metadata": None, "similarity": 0.5},
+            {"id": 1, "content": "weak chunk", "metadata": None, "similarity": 0.3},
+        ]
+
+    monkeypatch.setattr(embedding_service, "is_ai_configured", lambda: True)
+    monkeypatch.setattr(embedding_service, "generate_embedding", fake_embedding)
+    monkeypatch.setattr(embedding_service, "_search_fulltext_ids", no_hits)
+    monkeypatch.setattr(embedding_service, "_search_similar_ids", no_hits)
+    monkeypatch.setattr(embedding_service, "_search_vectorizer", vectorizer_hits)
+    monkeypatch.setattr(embedding_service, "_fetch_embedding_rows", no_rows)
+
+    results = await embedding_service.search_hybrid(
+        None, project_id=1, query_text="плитка", top_k=5,
+    )
+
+    assert [r["id"] for r in results] == [1, 2]
+    best = results[0]
+    assert best["content"] == "best chunk"
+    assert best["sources"] == ["vector"]
+    # Scored once, at rank 1 of the vector arm
+    assert best["score"] == 0.6 / (60 + 1)